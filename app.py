@@ -20,22 +20,35 @@ Features:
 
 import sys
 import os
+import re
 import json
 import time
 import math
+import hashlib
+import sqlite3
 import traceback
+import logging
+import importlib.util
+import shutil
 import subprocess
+import threading
+from collections import deque, OrderedDict, Counter
+from contextlib import closing
 from pathlib import Path
 from io import BytesIO
 from datetime import timedelta
-from urllib.parse import unquote, urlparse, parse_qs
+from functools import lru_cache
+from urllib.parse import unquote, urlsplit, urlunsplit, parse_qsl, urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import PIL
 from PIL import Image
 
 from PyQt5 import QtCore, QtGui, QtWidgets
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.QtCore import Qt, QTimer, QThread, QVariantAnimation, QEasingCurve, QThreadPool, QRunnable, QObject, QMutex, QMetaObject, pyqtSignal
+from PyQt5.QtGui import QIcon, QPixmap, QImage
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QLineEdit, QTextEdit,
     QVBoxLayout, QHBoxLayout, QFileDialog, QProgressBar, QMessageBox,
@@ -52,6 +65,30 @@ except Exception:
 CONFIG_FILE = Path.home() / ".multi_downloader_config.json"
 DEFAULT_DOWNLOAD_DIR = Path("C:/Downloads")
 DEFAULT_DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+TOOLS_DIR = Path(__file__).resolve().parent / "tools"
+CACHE_DIR = Path.home() / ".multi_downloader_cache"
+YTDLP_CACHE_DIR = CACHE_DIR / "ytdlp"
+META_CACHE_DB = CACHE_DIR / "meta.sqlite"
+META_CACHE_TTL = 6 * 3600           # seconds, single videos/files
+META_CACHE_TTL_PLAYLIST = 3600      # albums/playlists gain entries more often
+META_MEMORY_CACHE_SIZE = 512
+META_MEMORY_CACHE_BYTES = 64 * 1024 * 1024  # one video's info can be ~1 MB of JSON (captions)
+THUMB_CACHE_DIR = CACHE_DIR / "thumbs"
+THUMB_MEMORY_CACHE_SIZE = 64  # QPixmaps kept in RAM
+# per-folder archives of finished items, so batch re-runs skip them
+YTDLP_ARCHIVE_NAME = ".ytdlp_archive.txt"
+GALLERYDL_ARCHIVE_NAME = ".galdl_archive.sqlite3"
+GALLERYDL_IMPORTABLE = importlib.util.find_spec("gallery_dl") is not None
+_GALLERYDL_LOCK = threading.Lock()
+_gallerydl_config_loaded = False
+PROGRESS_EMIT_INTERVAL = 0.1  # seconds between forwarded progress updates
+THUMB_RANGE_BYTES = 256 * 1024  # most thumbnails fit; larger ones are refetched whole if the prefix doesn't decode
+CSV_PREVIEW_LINES = 1000
+LOG_MAX_LINES = 5000  # ring size for both the pending buffer and the log view
+DEFAULT_CONCURRENT_FRAGMENTS = 8
+DEFAULT_PARALLEL_DOWNLOADS = 3
+MAX_PER_HOST = 4  # in-flight downloads per host; extra urls for it wait their turn
+ARIA2C_ARGS = ["-x", "16", "-s", "16", "-k", "1M"]
 
 SUPPORTED_DOMAINS = [
     "youtube.com", "youtu.be", "facebook.com", "instagram.com", "tiktok.com",
@@ -59,6 +96,8 @@ SUPPORTED_DOMAINS = [
     "soundcloud.com", "vimeo.com", "bilibili.com", "mixcloud.com", "rumble.com",
     "odnoklassniki.ru", "ted.com"
 ]
+# one alternation scan over the text instead of a substring search per domain
+SUPPORTED_DOMAIN_RE = re.compile("|".join(re.escape(d) for d in SUPPORTED_DOMAINS))
 
 def load_config():
     try:
@@ -70,67 +109,411 @@ def load_config():
 
 def save_config(cfg):
     try:
-        CONFIG_FILE.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+        _write_atomic(CONFIG_FILE, json.dumps(cfg, indent=2).encode("utf-8"))
     except Exception:
         pass
 
 # -------------- Utilities --------------
+_REDDIT_MEDIA_RE = re.compile(r"^https?://(?:[\w-]+\.)?reddit\.com/media\?(?:[^#]*&)?url=([^&#]+)")
+_TRACKING_PARAMS = frozenset({
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "utm_name", "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "si", "feature", "ref_src", "ref_url",
+})
+# "there is no video" is covered by "no video"
+_ERR_NO_VIDEO = re.compile(r"no video|unsupported url", re.I)
+_ERR_BAD_FMT = re.compile(r"requested format is not available", re.I)
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+@lru_cache(maxsize=4096)
 def normalize_url(url: str) -> str:
     if not url:
         return url
     u = url.strip()
-    if "reddit.com/media" in u and "url=" in u:
-        try:
-            qs = parse_qs(urlparse(u).query)
-            if "url" in qs and qs["url"]:
-                return unquote(qs["url"][0])
-        except Exception:
-            pass
+    m = _REDDIT_MEDIA_RE.match(u)
+    if m:
+        return unquote(m.group(1))
+    if "?" not in u:
+        return u
+    try:
+        parts = urlsplit(u)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        kept = [(k, v) for k, v in query if k not in _TRACKING_PARAMS]
+        if len(kept) != len(query):
+            # only rebuild when something was stripped, so other urls keep
+            # their original encoding
+            return urlunsplit(parts._replace(query=urlencode(kept)))
+    except Exception:
+        pass
     return u
 
+# urls that are known to hold only images go straight to gallery-dl
+_GALLERY_URL_RE = re.compile(
+    r"^https?://(?:[\w-]+\.)?(?:reddit\.com/gallery/|imgur\.com/(?:a|gallery)/)"
+    r"|\.(?:jpe?g|png|gif|webp)$", re.I)
+_VIDEO_HOSTS = frozenset({
+    "youtube.com", "youtu.be", "vimeo.com", "twitch.tv", "tiktok.com",
+    "soundcloud.com", "bilibili.com", "mixcloud.com", "rumble.com", "ted.com",
+})
+
+@lru_cache(maxsize=4096)
+def _url_host(url: str) -> str:
+    # "www." / "m." variants count as the same host
+    host = (urlsplit(url).hostname or "").lower()
+    if host.startswith("www.") or host.startswith("m."):
+        host = host.split(".", 1)[1]
+    return host
+
+@lru_cache(maxsize=4096)
+def _classify(url: str) -> str:
+    """Return "gallery", "video" or "auto" (yt-dlp first, gallery-dl on failure)."""
+    if _GALLERY_URL_RE.search(url.split("?", 1)[0].split("#", 1)[0]):
+        return "gallery"
+    if _url_host(url) in _VIDEO_HOSTS:
+        return "video"
+    return "auto"
+
+def is_no_video_error(msg) -> bool:
+    return bool(msg) and _ERR_NO_VIDEO.search(msg) is not None
+
+def is_format_unavailable_error(msg) -> bool:
+    return bool(msg) and _ERR_BAD_FMT.search(msg) is not None
+
 def friendly_size(n):
     try:
         if not n:
             return "N/A"
-        n = float(n)
-        for unit in ["B","KB","MB","GB","TB"]:
-            if n < 1024:
-                return f"{n:3.1f}{unit}"
-            n /= 1024.0
-        return f"{n:.1f}PB"
+        return _friendly_size(int(n))
     except Exception:
         return "N/A"
 
+@lru_cache(maxsize=4096)
+def _friendly_size(n):
+    # exact byte counts as keys: format lists re-render the same sizes
+    # (cached info), and snapping would change what's displayed
+    # each unit is 2**10 of the previous one
+    unit = max(0, min(int(math.log2(n) / 10), len(_SIZE_UNITS) - 1))
+    return f"{n / (1 << (unit * 10)):3.1f}{_SIZE_UNITS[unit]}"
+
 def seconds_to_hhmmss(sec):
     try:
-        return str(timedelta(seconds=int(sec)))
+        return _seconds_to_hhmmss(int(sec))
     except Exception:
         return "00:00:00"
 
-def thumbnail_pixmap_from_url(url, max_w=320):
+@lru_cache(maxsize=4096)
+def _seconds_to_hhmmss(sec):
+    return str(timedelta(seconds=sec))
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+# extracted info dicts: in-process LRU in front of a sqlite table, keyed by
+# normalized url + cookies file. Entries are kept as JSON text so every
+# caller gets its own copy (yt-dlp mutates the dict while processing).
+_meta_mem = OrderedDict()  # key -> (expires_at, json text)
+_meta_mem_bytes = 0
+_meta_lock = threading.Lock()
+
+def _cookies_mtime(cookies):
+    if cookies:
+        try:
+            return int(os.path.getmtime(cookies))
+        except OSError:
+            pass
+    return 0
+
+def _meta_key(url, cookies=None):
+    # a new cookies.txt can unlock different formats, so its mtime is part of the key
+    key = f"{normalize_url(url)}\n{cookies or ''}\n{_cookies_mtime(cookies)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def _meta_remember(key, expires_at, text):
+    global _meta_mem_bytes
+    with _meta_lock:
+        old = _meta_mem.pop(key, None)
+        if old is not None:
+            _meta_mem_bytes -= len(old[1])
+        if len(text) > META_MEMORY_CACHE_BYTES:
+            return
+        _meta_mem[key] = (expires_at, text)
+        _meta_mem_bytes += len(text)
+        while len(_meta_mem) > META_MEMORY_CACHE_SIZE or _meta_mem_bytes > META_MEMORY_CACHE_BYTES:
+            _meta_mem_bytes -= len(_meta_mem.popitem(last=False)[1][1])
+
+def meta_cache_get(url, cookies=None, remember=True):
+    key = _meta_key(url, cookies)
+    now = time.time()
+    with _meta_lock:
+        hit = _meta_mem.get(key)
+        if hit is not None and hit[0] > now:
+            _meta_mem.move_to_end(key)
+            return json.loads(hit[1])
+    try:
+        with closing(sqlite3.connect(str(META_CACHE_DB), timeout=5)) as db:
+            row = db.execute("SELECT expires_at, info FROM meta WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None  # no db/table yet
+    if row is None or row[0] <= now:
+        return None
+    if remember:
+        _meta_remember(key, row[0], row[1])
+    return json.loads(row[1])
+
+def meta_cache_put(url, cookies, info, remember=True):
+    key = _meta_key(url, cookies)
+    now = time.time()
+    ttl = META_CACHE_TTL_PLAYLIST if info.get("_type") == "playlist" else META_CACHE_TTL
+    text = json.dumps(info)
+    if remember:
+        _meta_remember(key, now + ttl, text)
+    try:
+        META_CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+        # one short-lived connection per call: sqlite connections can't be
+        # shared between the GUI thread and pool threads
+        with closing(sqlite3.connect(str(META_CACHE_DB), timeout=5)) as db:
+            db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, fetched_at REAL, expires_at REAL, info TEXT)")
+            db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?)", (key, now, now + ttl, text))
+            db.execute("DELETE FROM meta WHERE expires_at < ?", (now,))  # keep the file bounded
+            db.commit()
+    except sqlite3.Error:
+        pass
+
+def _is_single_video(info):
+    return info.get("_type", "video") == "video"
+
+def cached_extract_info(url, ydl, videos_only=False):
+    """ydl.extract_info(download=False), served from the metadata cache when possible.
+
+    Returns (info, was_cached); info is None when yt-dlp skipped the url
+    because it's in the download archive. With videos_only (downloads), only
+    single videos are fully processed and cached, and entries stay out of
+    the memory LRU; a playlist comes back unprocessed so its entries are
+    extracted one by one while downloading.
+    """
+    cookies = ydl.params.get("cookiefile")
+    info = meta_cache_get(url, cookies, remember=not videos_only)
+    if info is not None and (not videos_only or _is_single_video(info)):
+        return info, True
+    if not videos_only:
+        info = ydl.extract_info(url, download=False)
+        if info is None:
+            return None, False  # already recorded in the archive; nothing to cache
+        info = ydl.sanitize_info(info)
+        meta_cache_put(url, cookies, info)
+        return info, False
+    info = ydl.extract_info(url, download=False, process=False)
+    if info is None or not _is_single_video(info):
+        return info, False
+    info = ydl.sanitize_info(ydl.process_ie_result(info, download=False))
+    meta_cache_put(url, cookies, info, remember=False)
+    return info, False
+
+# YoutubeDL construction (extractor registration, option parsing) is paid
+# once per pool thread instead of once per url
+_ydl_local = threading.local()
+_ydl_open = {}  # thread ident -> YoutubeDL, so shutdown can close every instance
+_ydl_open_lock = threading.Lock()
+
+class HookSlot:
+    """Progress hook owned by one YoutubeDL; the running worker plugs its callback in.
+
+    yt-dlp calls hooks from its own fragment threads too, so the callback
+    can't live in a threading.local.
+    """
+    def __init__(self):
+        self.hook = None
+
+    def __call__(self, d):
+        hook = self.hook
+        if hook:
+            hook(d)
+
+def _close_ydl(ydl):
     try:
-        r = requests.get(url, timeout=12)
+        ydl.__exit__(None, None, None)  # same cleanup as leaving a with block (saves cookies)
+    except Exception:
+        pass
+
+def thread_ydl(opts):
+    """Return this thread's (YoutubeDL, HookSlot), rebuilding only when opts change."""
+    import yt_dlp
+    # yt-dlp reads the cookie file once, so an edited file needs a new instance
+    key = json.dumps([opts, _cookies_mtime(opts.get("cookiefile"))], sort_keys=True, default=str)
+    if getattr(_ydl_local, "key", None) != key:
+        old = getattr(_ydl_local, "ydl", None)
+        if old is not None:
+            _close_ydl(old)
+        slot = HookSlot()
+        ydl = yt_dlp.YoutubeDL(dict(opts, progress_hooks=[slot]))
+        _ydl_local.ydl, _ydl_local.slot, _ydl_local.key = ydl, slot, key
+        with _ydl_open_lock:
+            _ydl_open[threading.get_ident()] = ydl
+    return _ydl_local.ydl, _ydl_local.slot
+
+def close_thread_ydls():
+    # called on exit once the pool is idle: pool threads don't run any
+    # cleanup of their own, and yt-dlp writes cookies back only on close
+    with _ydl_open_lock:
+        ydls = list(_ydl_open.values())
+        _ydl_open.clear()
+    for ydl in ydls:
+        _close_ydl(ydl)
+
+def pillow_variant():
+    # pillow-simd publishes as "<pillow version>.postN"
+    ver = getattr(PIL, "__version__", "?")
+    return f"Pillow-SIMD {ver}" if ".post" in ver else f"Pillow {ver}"
+
+# keep-alive pool shared by all thumbnail fetches (one TLS handshake per CDN host).
+# yt-dlp and gallery-dl keep their own pools: thread_ydl() reuses one
+# YoutubeDL per worker thread and gallery-dl runs a whole batch in one worker
+_HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=10,
+                            max_retries=Retry(total=2, backoff_factor=0.3))
+_HTTP_SESSION.mount("http://", _HTTP_ADAPTER)
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+
+def _fetch_thumbnail_bytes(url, full=False):
+    """Return (data, truncated). Unless full, only the first THUMB_RANGE_BYTES
+    are asked for; servers that ignore Range send the whole body with 200."""
+    headers = None if full else {"Range": f"bytes=0-{THUMB_RANGE_BYTES - 1}"}
+    with _HTTP_SESSION.get(url, headers=headers, stream=True, timeout=12) as r:
         r.raise_for_status()
-        im = Image.open(BytesIO(r.content))
-        im.thumbnail((max_w, max_w*2))
+        data = r.content
+        total = r.headers.get("Content-Range", "").rpartition("/")[2]
+        truncated = r.status_code == 206 and total.isdigit() and int(total) > len(data)
+    return data, truncated
+
+def _decode_thumbnail(data, max_w):
+    im = Image.open(BytesIO(data))
+    # let libjpeg downscale while decoding (no-op for non-JPEG); keep this
+    # before any .copy()/.load() or the full-size image gets decoded
+    im.draft("RGB", (max_w, max_w*2))
+    im.thumbnail((max_w, max_w*2), Image.BICUBIC)  # loads; raises on truncated data
+    return im
+
+def format_label(f):
+    vcodec = f.get("vcodec")
+    ext = f.get("ext")
+    if vcodec and vcodec != "none":
+        return f"{f.get('height') or ''}p [{ext}] ({friendly_size(f.get('filesize') or f.get('filesize_approx') or 0)})"
+    if f.get("acodec"):
+        return f"audio {f.get('abr') or ''}kbps [{ext}] ({friendly_size(f.get('filesize') or f.get('filesize_approx') or 0)})"
+    return f.get("format_note") or f.get("format") or ext
+
+def thumbnail_image_from_url(url, max_w=320):
+    # returns a QImage (not QPixmap) so it can run on a worker thread
+    cache_path = THUMB_CACHE_DIR / f"{hashlib.sha1(f'{max_w}:{url}'.encode('utf-8')).hexdigest()}.png"
+    if cache_path.exists():
+        img = QImage(str(cache_path))
+        if not img.isNull():
+            return img
+    try:
+        data, truncated = _fetch_thumbnail_bytes(url)
+        try:
+            im = _decode_thumbnail(data, max_w)
+        except Exception:
+            if not truncated:
+                raise
+            # the partial body didn't decode; only now pay for the whole file
+            im = _decode_thumbnail(_fetch_thumbnail_bytes(url, full=True)[0], max_w)
         buf = BytesIO()
         im.save(buf, format="PNG")
-        buf.seek(0)
-        pix = QPixmap()
-        pix.loadFromData(buf.read())
-        return pix
+        data = buf.getvalue()
+        try:
+            _write_atomic(cache_path, data)
+        except Exception:
+            pass
+        img = QImage()
+        img.loadFromData(data)
+        return img
     except Exception:
         return None
 
 # -------------- Workers --------------
-class YTDLPWorker(QThread):
-    progress = pyqtSignal(float, str)  # percent, speed/extra
-    finished = pyqtSignal(dict)        # {"ok":bool, "url":..., "error":...}
+class ProgressBoard:
+    """Latest (percent, info) per url. Workers overwrite their entry; the GUI
+    drains it on a timer, so per-callback progress never becomes a signal."""
+
+    def __init__(self):
+        self._lock = QMutex()
+        self._latest = {}
+
+    def post(self, url, pct, info):
+        self._lock.lock()
+        try:
+            self._latest[url] = (pct, info)
+        finally:
+            self._lock.unlock()
+
+    def take(self):
+        self._lock.lock()
+        try:
+            latest, self._latest = self._latest, {}
+        finally:
+            self._lock.unlock()
+        return latest
+
+class WorkerSignals(QObject):
+    # QRunnable is not a QObject, so pooled workers emit through this
+    finished = pyqtSignal(dict)             # {"ok":bool, "url"/"urls":..., "error"/"out":...}
     status = pyqtSignal(str)
+    files = pyqtSignal(int, int)            # gallery-dl: downloaded, skipped so far
+
+class ConfigSaveWorker(QRunnable):
+    def __init__(self, cfg):
+        super().__init__()
+        self.cfg = cfg  # snapshot; the GUI keeps mutating its own dict
+
+    def run(self):
+        save_config(self.cfg)
+
+class InfoWorker(QThread):
+    info_ready = pyqtSignal(str, dict)  # url, info
+    info_failed = pyqtSignal(str, str)  # url, error
 
-    def __init__(self, url, outdir, format_id=None, cookies=None, proxy=None, sections=None, retries=3, use_best=True):
+    def __init__(self, url, ydl):
         super().__init__()
         self.url = url
+        self.ydl = ydl
+
+    def run(self):
+        try:
+            info, _ = cached_extract_info(self.url, self.ydl)
+            if info is None:
+                self.info_failed.emit(self.url, "Already downloaded (in download archive)")
+            else:
+                self.info_ready.emit(self.url, info)
+        except Exception as e:
+            self.info_failed.emit(self.url, str(e))
+
+class ThumbnailSignals(QObject):
+    ready = pyqtSignal(str, QImage)  # thumbnail url, image
+
+class ThumbnailWorker(QRunnable):
+    def __init__(self, url, max_w=360):
+        super().__init__()
+        self.signals = ThumbnailSignals()
+        self.url = url
+        self.max_w = max_w
+
+    def run(self):
+        img = thumbnail_image_from_url(self.url, max_w=self.max_w)
+        if img is not None and not img.isNull():
+            self.signals.ready.emit(self.url, img)
+
+class YTDLPWorker(QRunnable):
+    def __init__(self, url, outdir, format_id=None, cookies=None, proxy=None, sections=None, retries=3, use_best=True,
+                 concurrent_fragments=DEFAULT_CONCURRENT_FRAGMENTS, aria2c=None, board=None, cancel=None):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self.board = board if board is not None else ProgressBoard()
+        self.cancel = cancel if cancel is not None else threading.Event()
+        self.url = url
         self.outdir = str(outdir)
         self.format_id = format_id
         self.cookies = cookies
@@ -138,15 +521,50 @@ class YTDLPWorker(QThread):
         self.sections = sections
         self.retries = retries
         self.use_best = use_best
+        self.concurrent_fragments = concurrent_fragments
+        self.aria2c = aria2c  # path/name of aria2c, or None to use the native downloader
+        self._last_emit = 0.0
+        self._last_status = None
 
     def run(self):
         # lazy import
         try:
             import yt_dlp
         except Exception as e:
-            self.finished.emit({"ok": False, "error": f"yt-dlp import error: {e}"})
+            self.signals.finished.emit({"ok": False, "url": self.url, "error": f"yt-dlp import error: {e}"})
             return
 
+        # one YoutubeDL per pool thread (thread_ydl), reused across urls while
+        # these options stay the same; instances are not shared across threads
+        ydl_opts = self._build_ydl_opts()
+
+        last_err = None
+        for attempt in range(1, self.retries+1):
+            if self.cancel.is_set():
+                return
+            try:
+                self.signals.status.emit(f"Starting download (attempt {attempt})")
+                ydl, slot = thread_ydl(ydl_opts)
+                slot.hook = self._progress_hook
+                try:
+                    self._download(ydl)
+                finally:
+                    slot.hook = None
+                self.signals.finished.emit({"ok": True, "url": self.url})
+                return
+            except Exception as e:
+                if self.cancel.is_set():
+                    return  # app is shutting down; nobody is waiting for a result
+                last_err = e
+                # retrying won't turn an image post into a video
+                if is_no_video_error(str(e)) or is_format_unavailable_error(str(e)):
+                    break
+                self.signals.status.emit(f"Error: {e} (retrying {attempt}/{self.retries})")
+                # exponential backoff (cut short on shutdown)
+                self.cancel.wait(min(10, 1.5 ** attempt))
+        self.signals.finished.emit({"ok": False, "url": self.url, "error": str(last_err)})
+
+    def _build_ydl_opts(self):
         fmt = None if self.use_best else self.format_id
         outtmpl = os.path.join(self.outdir, "%(title)s.%(ext)s")
         ydl_opts = {
@@ -157,9 +575,10 @@ class YTDLPWorker(QThread):
             "quiet": True,
             "no_warnings": True,
             "no_color": True,
-            "progress_hooks": [self._progress_hook],
             "format": fmt or "bestvideo+bestaudio/best",
-            "concurrent_fragment_downloads": 3
+            "concurrent_fragment_downloads": self.concurrent_fragments,
+            "cachedir": str(YTDLP_CACHE_DIR),
+            "download_archive": os.path.join(self.outdir, YTDLP_ARCHIVE_NAME)
         }
         if self.cookies:
             ydl_opts["cookiefile"] = self.cookies
@@ -167,25 +586,51 @@ class YTDLPWorker(QThread):
             ydl_opts["proxy"] = self.proxy
         if self.sections:
             ydl_opts["download_sections"] = {"*": self.sections}
-
-        last_err = None
-        for attempt in range(1, self.retries+1):
-            try:
-                self.status.emit(f"Starting download (attempt {attempt})")
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([self.url])
-                self.finished.emit({"ok": True, "url": self.url})
-                return
-            except Exception as e:
-                last_err = e
-                self.status.emit(f"Error: {e} (retrying {attempt}/{self.retries})")
-                # exponential backoff
-                time.sleep(min(10, 1.5 ** attempt))
-        self.finished.emit({"ok": False, "url": self.url, "error": str(last_err)})
+        if self.aria2c:
+            # plain HTTP(S) only; HLS/DASH keep the native fragment downloader
+            ydl_opts["external_downloader"] = {"http": self.aria2c}
+            ydl_opts["external_downloader_args"] = {"aria2c": ARIA2C_ARGS}
+        return ydl_opts
+
+    def _download(self, ydl):
+        # extraction goes through the metadata cache, so retries and re-runs
+        # (and Fetch Info before them) skip the round trip; stream urls in a
+        # cached entry can expire, so a failure on one falls back to a fresh extract
+        info, was_cached = cached_extract_info(self.url, ydl, videos_only=True)
+        if info is None:
+            self.signals.status.emit(f"Already in download archive — skipped: {self.url}")
+            return
+        if not _is_single_video(info):
+            # playlist/redirect: entries are extracted and downloaded one by one
+            ydl.process_ie_result(info, download=True)
+            return
+        try:
+            ydl.process_ie_result(info, download=True)
+        except Exception as e:
+            if not was_cached or is_format_unavailable_error(str(e)) or is_no_video_error(str(e)):
+                raise
+            self.signals.status.emit(f"Cached info failed ({e}) — extracting again")
+            info = ydl.extract_info(self.url, download=False)
+            if info is None:
+                return  # recorded in the archive meanwhile
+            info = ydl.sanitize_info(info)
+            meta_cache_put(self.url, self.cookies, info, remember=False)
+            ydl.process_ie_result(info, download=True)
 
     def _progress_hook(self, d):
+        if self.cancel.is_set():
+            from yt_dlp.utils import DownloadCancelled
+            raise DownloadCancelled()
+        # yt-dlp can call this hundreds of times a second on fragmented
+        # downloads; forward at most one "downloading" update per interval
         try:
-            if d.get("status") == "downloading":
+            status = d.get("status")
+            now = time.monotonic()
+            if status == "downloading" and status == self._last_status and now - self._last_emit < PROGRESS_EMIT_INTERVAL:
+                return
+            self._last_status = status
+            self._last_emit = now
+            if status == "downloading":
                 pct = 0.0
                 if d.get("_percent_str"):
                     try:
@@ -193,41 +638,193 @@ class YTDLPWorker(QThread):
                     except:
                         pct = 0.0
                 speed = d.get("_speed_str", "")
-                self.progress.emit(pct, speed)
-            elif d.get("status") == "finished":
-                self.progress.emit(100.0, "processing")
+                self.board.post(self.url, pct, speed)
+            elif status == "finished":
+                self.board.post(self.url, 100.0, "processing")
         except Exception:
             pass
 
-class GalleryDLWorker(QThread):
-    finished = pyqtSignal(dict)  # {"ok":bool, "out":...}
-    status = pyqtSignal(str)
-
-    def __init__(self, url, outdir, cookies=None, timeout=90):
+class GalleryDLWorker(QRunnable):
+    def __init__(self, urls, outdir, cookies=None, timeout=90, exe="gallery-dl", cancel=None):
         super().__init__()
-        self.url = url
+        self.signals = WorkerSignals()
+        self.cancel = cancel if cancel is not None else threading.Event()
+        self.exe = exe
+        self.urls = list(urls)
         self.outdir = str(outdir)
         self.cookies = cookies
-        self.timeout = timeout
+        self.timeout = timeout  # seconds without any output before giving up
+        self._timed_out = False
+        self._last_output = 0.0
 
     def run(self):
+        # gallery-dl is a Python package: when it's importable, run it in this
+        # process (no interpreter boot or extractor import per run); the CLI
+        # binary is only the fallback
+        if GALLERYDL_IMPORTABLE:
+            self._run_in_process()
+        else:
+            self._run_subprocess()
+
+    def _run_in_process(self):
         try:
-            cmd = ["gallery-dl", "-d", self.outdir, self.url]
+            from gallery_dl import config, exception, job, output
+        except Exception as e:
+            self.signals.finished.emit({"ok": False, "urls": self.urls, "out": f"gallery-dl import error: {e}"})
+            return
+        worker = self
+        counts = {"downloaded": 0, "skipped": 0}
+
+        class _Output(output.NullOutput):
+            # gallery-dl reports each file here instead of printing it
+            def start(self, path):
+                if worker.cancel.is_set():
+                    raise exception.StopExtraction()
+
+            def skip(self, path):
+                counts["skipped"] += 1
+                worker.signals.files.emit(counts["downloaded"], counts["skipped"])
+
+            def success(self, path, *args):
+                counts["downloaded"] += 1
+                worker.signals.files.emit(counts["downloaded"], counts["skipped"])
+
+        class _Job(job.DownloadJob):
+            # child jobs (sub-galleries) are built via self.__class__
+            def __init__(self, url, parent=None):
+                job.DownloadJob.__init__(self, url, parent)
+                self.out = _Output()
+
+        tail = deque(maxlen=20)
+
+        class _LogTail(logging.Handler):
+            # root logger sees every thread (e.g. urllib3 retries from the
+            # thumbnail session); only this worker's records are gallery-dl's
+            thread = threading.get_ident()
+
+            def filter(self, record):
+                return record.thread == self.thread
+
+            def emit(self, record):
+                msg = f"[{record.name}][{record.levelname.lower()}] {record.getMessage()}"
+                tail.append(msg)
+                worker.signals.status.emit(f"gallery-dl: {msg}")
+
+        handler = _LogTail(logging.WARNING)
+        rc = 0
+        self.signals.status.emit(f"Running gallery-dl ({len(self.urls)} url(s))...")
+        # gallery-dl's config is process-global, so in-process runs take turns
+        with _GALLERYDL_LOCK:
+            global _gallerydl_config_loaded
+            if not _gallerydl_config_loaded:
+                config.load()  # user's gallery-dl config files, read once
+                _gallerydl_config_loaded = True
+            config.set((), "base-directory", self.outdir)
+            config.set((), "archive", os.path.join(self.outdir, GALLERYDL_ARCHIVE_NAME))
+            # root-level keys override extractor ones, so an empty field must
+            # leave the user's per-extractor cookies alone
+            if self.cookies:
+                config.set((), "cookies", self.cookies)
+            else:
+                config.unset((), "cookies")
+            # no idle watchdog in-process (a thread can't be killed), so a
+            # network stall is bounded by gallery-dl's own socket timeout; an
+            # extractor stuck outside network I/O still holds the lock until
+            # the app exits
+            if config.get((), "timeout") is None:
+                config.set((), "timeout", self.timeout)
+            logging.getLogger().addHandler(handler)
+            try:
+                for url in self.urls:
+                    if self.cancel.is_set():
+                        return
+                    try:
+                        rc |= _Job(url).run()
+                    except Exception as e:
+                        tail.append(f"{url}: {e}")
+                        rc |= 1
+            finally:
+                logging.getLogger().removeHandler(handler)
+        if self.cancel.is_set():
+            return
+        if rc == 0:
+            self.signals.finished.emit({"ok": True, "urls": self.urls,
+                                        "out": f"gallery-dl: {counts['downloaded']} file(s) downloaded, {counts['skipped']} skipped"})
+        else:
+            self.signals.finished.emit({"ok": False, "urls": self.urls,
+                                        "out": "\n".join(tail) or f"gallery-dl exit {rc}"})
+
+    def _run_subprocess(self):
+        # one gallery-dl process for the whole batch: interpreter + extractor
+        # import cost is paid once instead of once per url
+        try:
+            cmd = [self.exe, "-d", self.outdir,
+                   "--download-archive", os.path.join(self.outdir, GALLERYDL_ARCHIVE_NAME)]
             if self.cookies:
                 cmd.extend(["--cookies", self.cookies])
-            self.status.emit("Running gallery-dl...")
-            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
-            if proc.returncode == 0:
-                self.finished.emit({"ok": True, "out": proc.stdout.strip() or "gallery-dl succeeded"})
+            # urls go in over stdin rather than argv: no command-line length
+            # limit (32K chars on Windows) however large the batch is
+            cmd.extend(["--input-file", "-"])
+            self.signals.status.emit(f"Running gallery-dl ({len(self.urls)} url(s))...")
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT, text=True, bufsize=1)
+            try:
+                proc.stdin.write("\n".join(self.urls) + "\n")
+            finally:
+                proc.stdin.close()  # gallery-dl reads the input file to EOF before starting
+            self._last_output = time.monotonic()
+            stop = threading.Event()
+            watchdog = threading.Thread(target=self._watchdog, args=(proc, stop), daemon=True)
+            watchdog.start()
+            tail = deque(maxlen=20)  # only the last lines are kept for error reports
+            downloaded = skipped = 0
+            try:
+                for line in proc.stdout:
+                    self._last_output = time.monotonic()
+                    line = line.strip()
+                    if not line:
+                        continue
+                    tail.append(line)
+                    # piped output: "<path>" downloaded, "# <path>" skipped
+                    # (archive/existing), "[extractor][level] ..." log lines
+                    if line.startswith("["):
+                        self.signals.status.emit(f"gallery-dl: {line}")
+                        continue
+                    if line.startswith("# "):
+                        skipped += 1
+                    else:
+                        downloaded += 1
+                    self.signals.files.emit(downloaded, skipped)
+                proc.wait()
+            finally:
+                stop.set()
+            if self.cancel.is_set():
+                return
+            if self._timed_out:
+                self.signals.finished.emit({"ok": False, "urls": self.urls,
+                                            "out": f"gallery-dl timeout (no output for {self.timeout}s)."})
+            elif proc.returncode == 0:
+                self.signals.finished.emit({"ok": True, "urls": self.urls,
+                                            "out": f"gallery-dl: {downloaded} file(s) downloaded, {skipped} skipped"})
             else:
-                msg = (proc.stderr or proc.stdout or f"gallery-dl exit {proc.returncode}").strip()
-                self.finished.emit({"ok": False, "out": msg})
+                msg = "\n".join(tail) or f"gallery-dl exit {proc.returncode}"
+                self.signals.finished.emit({"ok": False, "urls": self.urls, "out": msg})
         except FileNotFoundError:
-            self.finished.emit({"ok": False, "out": "gallery-dl not found (install it)."})
-        except subprocess.TimeoutExpired:
-            self.finished.emit({"ok": False, "out": "gallery-dl timeout."})
+            self.signals.finished.emit({"ok": False, "urls": self.urls, "out": "gallery-dl not found (install it)."})
         except Exception as e:
-            self.finished.emit({"ok": False, "out": f"gallery-dl error: {e}"})
+            self.signals.finished.emit({"ok": False, "urls": self.urls, "out": f"gallery-dl error: {e}"})
+
+    def _watchdog(self, proc, stop):
+        # big albums can legitimately run for a long time, so only kill
+        # gallery-dl once it has gone quiet for self.timeout seconds
+        while not stop.wait(1.0):
+            if self.cancel.is_set() or time.monotonic() - self._last_output > self.timeout:
+                self._timed_out = True
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+                return
 
 # -------------- Main App --------------
 class MultiDownloader(QWidget):
@@ -241,31 +838,92 @@ class MultiDownloader(QWidget):
         self.clip_enabled = False
         self.clip_last = ""
         self.startup_enabled = self.cfg.get("startup", False)
-
-        self.current_worker = None
-        self.gallery_worker = None
-        self.queue = []  # list of urls for batch
+        self.concurrent_fragments = int(self.cfg.get("concurrent_fragments", DEFAULT_CONCURRENT_FRAGMENTS))
+        self.use_aria2c = self.cfg.get("use_aria2c", False)
+        self.parallel_downloads = int(self.cfg.get("parallel_downloads", DEFAULT_PARALLEL_DOWNLOADS))
+        # resolve external tools once instead of paying a failed spawn per url
+        self._gallerydl_exe = shutil.which("gallery-dl")
+        bundled_aria2c = TOOLS_DIR / "aria2c.exe"
+        self._aria2c_exe = str(bundled_aria2c) if bundled_aria2c.exists() else shutil.which("aria2c")
+
+        # downloads run as QRunnables; the pool bounds how many overlap
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.parallel_downloads)
+        # keep pool threads (and their YoutubeDL, see thread_ydl) for the whole
+        # session: an expired thread would drop its instance without closing it
+        self.pool.setExpiryTimeout(-1)
+        self.cancel_event = threading.Event()  # set on exit; workers abort cooperatively
+        self.queue = OrderedDict()  # host -> deque of (url, use_best) waiting for a pool slot
+        self.item_pcts = {}  # url -> percent for in-flight yt-dlp items
+        self.active_downloads = 0
+        self.host_active = Counter()  # host -> in-flight yt-dlp downloads
+        self.batch_format_id = None
+        self.batch_sections = None
+        self.gallery_pending = []  # urls yt-dlp found no video in
+        self.csv_urls = []  # full list from Load CSV; urls_text only holds a preview
+        self.csv_preview = ""
         self.batch_total = 0
         self.batch_done = 0
+        self._last_logged_done_pct = -1  # batch_done percent the last "Batch x/y" line was logged at
+        self.batch_failures = []  # (url(s), error) reported in one summary at the end
+        self._host_cap_logged = False
+        self._batch_reported = False
+        self._batch_lock = QMutex()
+        self.info_worker = None
+        self._info_then = None
+        self._ydl_info = None
+        self._ydl_info_key = None
+        self.thumb_cache = OrderedDict()  # thumbnail url -> QPixmap, LRU order
+        self.thumb_wanted = None  # latest requested thumbnail; stale results aren't shown
+
+        # config writes: dirty flag + 500 ms coalescing timer, written on a
+        # single-thread pool so saves land in order
+        self._cfg_dirty = False
+        self._cfg_timer = QTimer(self)
+        self._cfg_timer.setSingleShot(True)
+        self._cfg_timer.setInterval(500)
+        self._cfg_timer.timeout.connect(self._flush_config)
+        self.io_pool = QThreadPool(self)
+        self.io_pool.setMaxThreadCount(1)
+
+        # log lines are buffered and appended to the view in one batch every
+        # 100 ms, so chatty progress logging costs one layout pass per tick
+        self._log_buf = deque(maxlen=LOG_MAX_LINES)
+        self._log_lock = QMutex()
+        self.log_timer = QTimer(self)
+        self.log_timer.setTimerType(Qt.CoarseTimer)
+        self.log_timer.setInterval(100)
+        self.log_timer.timeout.connect(self._drain_log)
 
         self._build_ui()
         self._connect_signals()
         self._setup_tray()
         if self.dark_mode:
             self.apply_dark_theme(True)
-
-        # smooth progress interpolation
-        self.item_target_pct = 0.0
-        self.item_display_pct = 0.0
-        self.item_progress_timer = QTimer(self)
-        self.item_progress_timer.setInterval(40)  # ~25fps
-        self.item_progress_timer.timeout.connect(self._animate_item_progress)
-        self.item_progress_timer.start()
-
-        # clipboard timer (lightweight, default off)
-        self.clip_timer = QTimer(self)
-        self.clip_timer.setInterval(2000)
-        self.clip_timer.timeout.connect(self._check_clipboard)
+        self.log("Image backend:", pillow_variant())
+
+        # smooth progress: Qt's animation driver interpolates the item bar,
+        # so there is no Python tick while nothing changes. The driver runs on
+        # a precise ~16 ms timer, so there's no coarse-timer jitter to correct
+        self.item_anim = QVariantAnimation(self)
+        self.item_anim.setDuration(300)
+        self.item_anim.setEasingCurve(QEasingCurve.OutCubic)
+        self.item_anim.valueChanged.connect(self._set_item_value)
+
+        # workers post progress to a shared board (no signal per callback);
+        # this ~30 Hz timer runs only while downloads are active
+        self.progress_board = ProgressBoard()
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setTimerType(Qt.PreciseTimer)
+        self.progress_timer.setInterval(33)
+        self.progress_timer.timeout.connect(self._flush_progress)
+
+        # clipboard watch is driven by QClipboard.dataChanged (default off);
+        # this timer only debounces bursts, some platforms fire twice per copy
+        self.clip_debounce = QTimer(self)
+        self.clip_debounce.setSingleShot(True)
+        self.clip_debounce.setInterval(250)
+        self.clip_debounce.timeout.connect(self._check_clipboard)
 
     # ---------- UI build ----------
     def _build_ui(self):
@@ -353,6 +1011,7 @@ class MultiDownloader(QWidget):
         right_col.addWidget(self.status_label)
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.document().setMaximumBlockCount(LOG_MAX_LINES)
         self.log_text.setFixedHeight(140)
         right_col.addWidget(self.log_text)
 
@@ -367,6 +1026,22 @@ class MultiDownloader(QWidget):
         self.startup_toggle = QCheckBox("Start with Windows (off)")
         self.startup_toggle.setChecked(bool(self.startup_enabled))
         settings_row.addWidget(self.startup_toggle)
+        settings_row.addWidget(QLabel("Fragments:"))
+        self.fragments_spin = QSpinBox()
+        self.fragments_spin.setRange(1, 16)
+        self.fragments_spin.setValue(self.concurrent_fragments)
+        self.fragments_spin.setToolTip("Concurrent fragment downloads for HLS/DASH (-N)")
+        settings_row.addWidget(self.fragments_spin)
+        settings_row.addWidget(QLabel("Parallel:"))
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, 8)
+        self.parallel_spin.setValue(self.parallel_downloads)
+        self.parallel_spin.setToolTip(f"Number of urls downloaded at the same time (at most {MAX_PER_HOST} from one site)")
+        settings_row.addWidget(self.parallel_spin)
+        self.aria2c_toggle = QCheckBox("aria2c")
+        self.aria2c_toggle.setChecked(bool(self.use_aria2c))
+        self.aria2c_toggle.setToolTip("Use aria2c for plain HTTP downloads")
+        settings_row.addWidget(self.aria2c_toggle)
         settings_row.addStretch()
         self.save_settings_btn = QPushButton("Save Settings")
         settings_row.addWidget(self.save_settings_btn)
@@ -387,12 +1062,15 @@ class MultiDownloader(QWidget):
         self.load_csv_btn.clicked.connect(self.on_load_csv)
         self.browse_cookies.clicked.connect(self.on_browse_cookies)
         self.change_folder_btn.clicked.connect(self.on_change_folder)
-        self.format_combo.currentIndexChanged.connect(lambda _: self.best_checkbox.setChecked(False))
+        self.format_combo.currentIndexChanged.connect(self.on_format_changed)
         self.browse_cookies.clicked.connect(self.on_browse_cookies)
         self.save_settings_btn.clicked.connect(self.on_save_settings)
         self.dark_toggle.stateChanged.connect(self.on_toggle_dark)
         self.clip_toggle.stateChanged.connect(self.on_toggle_clip)
         self.startup_toggle.stateChanged.connect(self.on_toggle_startup)
+        self.fragments_spin.valueChanged.connect(self.on_fragments_changed)
+        self.parallel_spin.valueChanged.connect(self.on_parallel_changed)
+        self.aria2c_toggle.stateChanged.connect(self.on_toggle_aria2c)
 
     # ---------- Tray icon ----------
     def _setup_tray(self):
@@ -437,13 +1115,50 @@ class MultiDownloader(QWidget):
         self.raise_()
         self.activateWindow()
 
+    def closeEvent(self, event):
+        self._shutdown_workers()
+        self._flush_config(wait=True)
+        super().closeEvent(event)
+
     def exit_app(self):
+        self._shutdown_workers()
+        self._flush_config(wait=True)
         try:
             self.tray.hide()
         except Exception:
             pass
         QApplication.quit()
 
+    def _shutdown_workers(self):
+        # like Executor.shutdown(cancel_futures=True): drop queued items and
+        # ask running ones to stop, so the pool doesn't keep the process alive
+        self.queue.clear()
+        self.gallery_pending = []
+        self.pool.clear()
+        self.cancel_event.set()
+        self.pool.waitForDone(5000)
+        if self.info_worker is not None:
+            # a QThread destroyed while running aborts the process; extraction
+            # can't be interrupted, so wait for it to return
+            self.info_worker.wait()
+        close_thread_ydls()
+        QThreadPool.globalInstance().waitForDone(2000)  # thumbnail fetches
+        _HTTP_SESSION.close()
+
+    # ---------- Config persistence ----------
+    def _schedule_config_save(self):
+        # coalesce bursts of toggles into one write, done off the GUI thread
+        self._cfg_dirty = True
+        self._cfg_timer.start()
+
+    def _flush_config(self, wait=False):
+        if self._cfg_dirty:
+            self._cfg_dirty = False
+            self._cfg_timer.stop()
+            self.io_pool.start(ConfigSaveWorker(dict(self.cfg)))
+        if wait:
+            self.io_pool.waitForDone()
+
     # ---------- Settings handlers ----------
     def on_save_settings(self):
         self.cfg["download_dir"] = str(self.download_dir)
@@ -451,14 +1166,40 @@ class MultiDownloader(QWidget):
         self.cfg["proxy"] = self.proxy
         self.cfg["dark_mode"] = bool(self.dark_toggle.isChecked())
         self.cfg["startup"] = bool(self.startup_toggle.isChecked())
-        save_config(self.cfg)
+        self.cfg["concurrent_fragments"] = self.fragments_spin.value()
+        self.cfg["use_aria2c"] = bool(self.aria2c_toggle.isChecked())
+        self.cfg["parallel_downloads"] = self.parallel_spin.value()
+        self._schedule_config_save()
         QMessageBox.information(self, "Saved", "Settings saved.")
 
     def on_toggle_dark(self, state):
         on = bool(state == Qt.Checked)
         self.apply_dark_theme(on)
         self.cfg["dark_mode"] = on
-        save_config(self.cfg)
+        self._schedule_config_save()
+
+    def on_fragments_changed(self, n):
+        self.concurrent_fragments = n
+        self.cfg["concurrent_fragments"] = n
+        self._schedule_config_save()
+
+    def on_parallel_changed(self, n):
+        self.parallel_downloads = n
+        self.pool.setMaxThreadCount(n)
+        self.cfg["parallel_downloads"] = n
+        self._schedule_config_save()
+        if self.queue:
+            self._advance_queue()
+
+    def on_toggle_aria2c(self, state):
+        self.use_aria2c = bool(state == Qt.Checked)
+        if self.use_aria2c and not self._aria2c_exe:
+            self.log("aria2c not found (put aria2c.exe in tools/) — using yt-dlp's downloader")
+        self.cfg["use_aria2c"] = self.use_aria2c
+        self._schedule_config_save()
+
+    def _aria2c_path(self):
+        return self._aria2c_exe if self.use_aria2c else None
 
     def apply_dark_theme(self, on: bool):
         if on:
@@ -473,12 +1214,16 @@ class MultiDownloader(QWidget):
 
     def on_toggle_clip(self, state):
         enable = bool(state == Qt.Checked)
+        if enable == self.clip_enabled:
+            return
         self.clip_enabled = enable
+        cb = QApplication.clipboard()
         if enable:
-            self.clip_timer.start()
+            cb.dataChanged.connect(self.clip_debounce.start)
             self.log("Clipboard watch enabled")
         else:
-            self.clip_timer.stop()
+            cb.dataChanged.disconnect(self.clip_debounce.start)
+            self.clip_debounce.stop()
             self.log("Clipboard watch paused")
 
     def on_toggle_startup(self, state):
@@ -491,7 +1236,7 @@ class MultiDownloader(QWidget):
         else:
             self.startup_enabled = enable
             self.cfg["startup"] = enable
-            save_config(self.cfg)
+            self._schedule_config_save()
             self.log(f"Startup {'enabled' if enable else 'disabled'}")
 
     def _set_startup(self, enable: bool):
@@ -515,10 +1260,32 @@ class MultiDownloader(QWidget):
 
     # ---------- Logging ----------
     def log(self, *parts):
-        try:
-            s = " ".join(str(p) for p in parts)
-            self.log_text.append(s)
+        # safe from any thread: only touches the buffer under the lock. The
+        # status label is set right away on the GUI thread, so status text
+        # set after a log() call isn't overwritten by the next drain
+        s = " ".join(str(p) for p in parts)
+        if threading.current_thread() is threading.main_thread():
             self.status_label.setText(s)
+        self._log_lock.lock()
+        try:
+            self._log_buf.append(s)
+        finally:
+            self._log_lock.unlock()
+        if not self.log_timer.isActive():
+            QMetaObject.invokeMethod(self.log_timer, "start", Qt.QueuedConnection)
+
+    def _drain_log(self):
+        self._log_lock.lock()
+        try:
+            lines = list(self._log_buf)
+            self._log_buf.clear()
+        finally:
+            self._log_lock.unlock()
+        if not lines:
+            self.log_timer.stop()
+            return
+        try:
+            self.log_text.append("\n".join(lines))
         except Exception:
             pass
 
@@ -529,7 +1296,7 @@ class MultiDownloader(QWidget):
             txt = cb.text().strip()
             if txt and txt != self.clip_last:
                 low = txt.lower()
-                if any(d in low for d in SUPPORTED_DOMAINS) and ("\n" not in txt):
+                if SUPPORTED_DOMAIN_RE.search(low) is not None and ("\n" not in txt):
                     self.clip_last = txt
                     resp = QMessageBox.question(self, "Clipboard URL detected",
                                                 f"Detected URL in clipboard:\n{txt}\n\nDownload now (Best)?",
@@ -554,19 +1321,35 @@ class MultiDownloader(QWidget):
         f, _ = QFileDialog.getOpenFileName(self, "Open CSV / TXT with URLs (one per line)", "", "Text Files (*.txt *.csv);;All Files (*)")
         if not f:
             return
+        # stream line by line and dedupe; the text box only gets a preview so
+        # huge lists don't have to be laid out by QTextEdit
+        urls = []
+        seen = set()
         try:
-            txt = Path(f).read_text(encoding="utf-8")
-            self.urls_text.setPlainText(txt)
-            QMessageBox.information(self, "Loaded", "Loaded URLs into input area.")
+            with open(f, encoding="utf-8") as fh:
+                for line in fh:
+                    u = normalize_url(line.strip())
+                    if u and u not in seen:
+                        seen.add(u)
+                        urls.append(u)
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Could not load file: {e}")
+            return
+        self.csv_urls = urls
+        self.csv_preview = "\n".join(urls[:CSV_PREVIEW_LINES])
+        self.urls_text.setPlainText(self.csv_preview)
+        msg = f"Loaded {len(urls):,} unique URLs"
+        if len(urls) > CSV_PREVIEW_LINES:
+            msg += f" (showing first {CSV_PREVIEW_LINES:,})"
+        self.log(msg)
+        QMessageBox.information(self, "Loaded", msg + ".")
 
     def on_browse_cookies(self):
         f, _ = QFileDialog.getOpenFileName(self, "Select cookies.txt (Netscape)", "", "Text Files (*.txt);;All Files (*)")
         if f:
             self.cookies_edit.setText(f)
             self.cfg["cookies"] = f
-            save_config(self.cfg)
+            self._schedule_config_save()
             self.log("Using cookies:", f)
 
     def on_change_folder(self):
@@ -575,9 +1358,13 @@ class MultiDownloader(QWidget):
             self.download_dir = Path(d)
             self.folder_label.setText(str(self.download_dir))
             self.cfg["download_dir"] = str(self.download_dir)
-            save_config(self.cfg)
+            self._schedule_config_save()
             self.log("Download folder set:", d)
 
+    def on_format_changed(self, _index):
+        # picking a specific format overrides "best"
+        self.best_checkbox.setChecked(False)
+
     # ---------- Fetch info ----------
     def on_fetch_info(self):
         txt = self.urls_text.toPlainText().strip()
@@ -587,62 +1374,116 @@ class MultiDownloader(QWidget):
         url = normalize_url(txt.splitlines()[0].strip())
         self._fetch_and_show(url)
 
-    def _fetch_and_show(self, url):
+    def _fetch_and_show(self, url, then=None):
+        # extraction runs on an InfoWorker; `then(url)` runs after the result
+        # (success or failure) has been shown
+        if self.info_worker is not None and self.info_worker.isRunning():
+            self.log("Still fetching info — please wait.")
+            return
         self.log("Fetching info for", url)
         self.status_label.setText("Fetching info...")
-        QApplication.processEvents()
         try:
             import yt_dlp
         except Exception:
             QMessageBox.warning(self, "Missing", "yt-dlp not installed. Install: pip install yt-dlp")
             return
-        opts = {"quiet": True, "no_warnings": True}
-        cookies = self.cookies_edit.text().strip()
-        if cookies:
-            opts["cookiefile"] = cookies
-        try:
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-            title = info.get("title") or info.get("id") or url
-            uploader = info.get("uploader") or info.get("channel") or ""
-            duration = seconds_to_hhmmss(info.get("duration") or 0)
-            self.meta_label.setText(f"<b>{title}</b>\n{uploader}\nDuration: {duration}")
-            thumb = info.get("thumbnail")
-            if thumb:
-                pix = thumbnail_pixmap_from_url(thumb, max_w=360)
-                if pix:
-                    self.thumb_label.setPixmap(pix.scaled(self.thumb_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
-            # populate formats
-            formats = info.get("formats", []) or []
-            friendly = []
-            seen = set()
-            for f in formats:
-                key = (f.get("height"), f.get("abr"), f.get("ext"))
-                if key in seen:
-                    continue
-                seen.add(key)
-                size = f.get("filesize") or f.get("filesize_approx") or 0
-                if f.get("vcodec") and f.get("vcodec") != "none":
-                    label = f"{f.get('height') or ''}p [{f.get('ext')}] ({friendly_size(size)})"
-                elif f.get("acodec") and (not f.get("vcodec") or f.get("vcodec") == "none"):
-                    label = f"audio {f.get('abr') or ''}kbps [{f.get('ext')}] ({friendly_size(size)})"
-                else:
-                    label = f.get("format_note") or f.get("format") or f.get("ext")
-                friendly.append((label, f.get("format_id")))
-            self.format_combo.clear()
-            for lbl, fid in friendly:
-                self.format_combo.addItem(lbl, fid)
-            self.format_combo.setEnabled(len(friendly) > 0)
-            self.best_checkbox.setEnabled(True)
-            self.status_label.setText("Info fetched.")
-            self.log("Formats fetched:", len(friendly))
-        except Exception as e:
-            msg = str(e)
-            self.log("Fetch failed:", msg)
-            self.meta_label.setText("Failed to fetch: " + msg)
-            self.status_label.setText("Fetch failed")
-            if "no video" in msg.lower() or "there is no video" in msg.lower():
-                QMessageBox.information(self, "No video", "No video found — likely image-only post. gallery-dl fallback will be used when downloading (cookies may be required).")
+        self.fetch_btn.setEnabled(False)
+        self.choose_btn.setEnabled(False)
+        self._info_then = then
+        self.info_worker = InfoWorker(url, self._info_ydl())
+        self.info_worker.info_ready.connect(self._on_info_ready, Qt.QueuedConnection)
+        self.info_worker.info_failed.connect(self._on_info_failed, Qt.QueuedConnection)
+        self.info_worker.start()
+
+    def _is_stale_fetch(self, url):
+        # the slot is queued: a newer fetch may have replaced info_worker in between
+        return self.info_worker is None or url != self.info_worker.url
+
+    def _on_info_ready(self, url, info):
+        if self._is_stale_fetch(url):
+            return
+        title = info.get("title") or info.get("id") or url
+        uploader = info.get("uploader") or info.get("channel") or ""
+        duration = seconds_to_hhmmss(info.get("duration") or 0)
+        self.meta_label.setText(f"<b>{title}</b>\n{uploader}\nDuration: {duration}")
+        thumb = info.get("thumbnail")
+        if thumb:
+            self._show_thumbnail(thumb)
+        # populate formats
+        formats = info.get("formats", []) or []
+        # first format wins per (height, abr, ext)
+        unique = {}
+        for f in formats:
+            unique.setdefault((f.get("height"), f.get("abr"), f.get("ext")), f)
+        friendly = [(format_label(f), f.get("format_id")) for f in unique.values()]
+        self.format_combo.blockSignals(True)
+        self.format_combo.clear()
+        for lbl, fid in friendly:
+            self.format_combo.addItem(lbl, fid)
+        self.format_combo.blockSignals(False)
+        if friendly:
+            # what the first addItem's currentIndexChanged used to do
+            self.best_checkbox.setChecked(False)
+        self.format_combo.setEnabled(len(friendly) > 0)
+        self.best_checkbox.setEnabled(True)
+        self.status_label.setText("Info fetched.")
+        self.log("Formats fetched:", len(friendly))
+        self._finish_fetch(url)
+
+    def _on_info_failed(self, url, msg):
+        if self._is_stale_fetch(url):
+            return
+        self.log("Fetch failed:", msg)
+        self.meta_label.setText("Failed to fetch: " + msg)
+        self.status_label.setText("Fetch failed")
+        if is_no_video_error(msg):
+            QMessageBox.information(self, "No video", "No video found — likely image-only post. gallery-dl fallback will be used when downloading (cookies may be required).")
+        self._finish_fetch(url)
+
+    def _finish_fetch(self, url):
+        self.fetch_btn.setEnabled(True)
+        self.choose_btn.setEnabled(True)
+        then, self._info_then = self._info_then, None
+        if then:
+            then(url)
+
+    def _info_ydl(self):
+        # one YoutubeDL for all info fetches; rebuilt only when cookies/proxy
+        # change since yt-dlp binds its cookiejar and proxy on first request
+        import yt_dlp
+        key = (self.cookies_edit.text().strip(), self.proxy)
+        if self._ydl_info is None or self._ydl_info_key != key:
+            opts = {"quiet": True, "no_warnings": True, "cachedir": str(YTDLP_CACHE_DIR)}
+            if key[0]:
+                opts["cookiefile"] = key[0]
+            if key[1]:
+                opts["proxy"] = key[1]
+            self._ydl_info = yt_dlp.YoutubeDL(opts)
+            self._ydl_info_key = key
+        return self._ydl_info
+
+    def _show_thumbnail(self, url):
+        self.thumb_wanted = url
+        pix = self.thumb_cache.get(url)
+        if pix is not None:
+            self.thumb_cache.move_to_end(url)
+            self._set_thumbnail(pix)
+            return
+        # download + decode on the global pool; only the slot touches widgets
+        worker = ThumbnailWorker(url, max_w=360)
+        worker.signals.ready.connect(self._on_thumbnail_ready, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_thumbnail_ready(self, url, img):
+        pix = QPixmap.fromImage(img)
+        self.thumb_cache[url] = pix
+        if len(self.thumb_cache) > THUMB_MEMORY_CACHE_SIZE:
+            self.thumb_cache.popitem(last=False)
+        if url == self.thumb_wanted:
+            self._set_thumbnail(pix)
+
+    def _set_thumbnail(self, pix):
+        self.thumb_label.setPixmap(pix.scaled(self.thumb_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
     # ---------- Direct download ----------
     def on_direct_download(self):
@@ -650,10 +1491,10 @@ class MultiDownloader(QWidget):
         if not txt:
             QMessageBox.information(self, "No URL", "Paste at least one URL.")
             return
-        urls = [normalize_url(u.strip()) for u in txt.splitlines() if u.strip()]
-        self.batch_total = len(urls)
-        self.batch_done = 0
-        self.overall_progress.setValue(0)
+        if self.csv_urls and txt == self.csv_preview.strip():
+            urls = self.csv_urls
+        else:
+            urls = [u.strip() for u in txt.splitlines() if u.strip()]
         self._start_batch(urls, use_best=True)
 
     # ---------- Choose & download ----------
@@ -663,12 +1504,15 @@ class MultiDownloader(QWidget):
             QMessageBox.information(self, "No URL", "Paste at least one URL.")
             return
         url = normalize_url(txt.splitlines()[0].strip())
-        self._fetch_and_show(url)
+        self._fetch_and_show(url, then=self._choose_after_fetch)
+
+    def _choose_after_fetch(self, url):
         # if no formats, offer gallery-dl
         if self.format_combo.count() == 0:
             ans = QMessageBox.question(self, "No formats", "No video/audio formats detected. Try gallery-dl fallback?", QMessageBox.Yes | QMessageBox.No)
             if ans == QMessageBox.Yes:
-                self._run_gallery_dl(url)
+                self._reset_batch(1)
+                self._start_gallery([url])
             return
         # pick current selection
         fid = self.format_combo.currentData()
@@ -682,173 +1526,247 @@ class MultiDownloader(QWidget):
 
     # ---------- Start batch processing ----------
     def _start_batch(self, urls, use_best=True, format_id=None, sections=None):
-        self.queue = list(urls)
-        self.batch_total = len(self.queue)
+        urls = self._dedupe_urls(urls)
+        self.item_pcts = {}
+        self._reset_batch(len(urls))
+        self.batch_format_id = format_id
+        self.batch_sections = sections
+        # known image urls skip the yt-dlp attempt and start right away;
+        # everything else goes to yt-dlp first, and "no video" failures are
+        # collected for one gallery-dl run at the end
+        gallery = [u for u in urls if _classify(u) == "gallery"]
+        self.queue = OrderedDict()
+        for url in urls:
+            if _classify(url) != "gallery":
+                self.queue.setdefault(_url_host(url), deque()).append((url, use_best))
+        self.gallery_pending = []
+        if gallery:
+            self.log(f"Image/gallery urls — using gallery-dl for {len(gallery)} url(s)")
+            self._start_gallery(gallery)
+        # deferred only so the click handler returns before the first dispatch
+        QtCore.QTimer.singleShot(0, self._advance_queue)
+
+    def _reset_batch(self, total):
+        self.batch_total = total
         self.batch_done = 0
+        self.batch_failures = []
+        self._batch_reported = False
+        self._host_cap_logged = False
+        self._last_logged_done_pct = -1
         self.overall_progress.setValue(0)
-        # process sequentially to keep things simple
-        QtCore.QTimer.singleShot(50, lambda: self._process_next_in_queue(use_best, format_id, sections))
 
-    def _process_next_in_queue(self, use_best, format_id, sections):
-        if not self.queue:
-            self.log("Batch complete.")
-            self.status_label.setText("All done.")
+    def _dedupe_urls(self, urls):
+        # drop duplicates after normalization
+        seen = set()
+        kept = []
+        for u in urls:
+            n = normalize_url(u)
+            if not n or n in seen:
+                continue
+            seen.add(n)
+            kept.append(n)
+        if len(kept) != len(urls):
+            self.log(f"Queue: {len(kept)} url(s), skipped {len(urls) - len(kept)} duplicate(s)")
+        return kept
+
+    def _next_queued(self):
+        # oldest queued item of the first host under MAX_PER_HOST in-flight
+        # downloads; one step per queued host, not per queued url
+        for host, items in self.queue.items():
+            if self.host_active[host] < MAX_PER_HOST:
+                item = items.popleft()
+                if not items:
+                    del self.queue[host]
+                return item
+        return None
+
+    def _advance_queue(self):
+        # called on every worker finish: keep up to parallel_downloads yt-dlp
+        # items in flight. active_downloads is the slot count; it is only
+        # touched on the GUI thread, so no QSemaphore is needed
+        while self.queue and self.active_downloads < self.parallel_downloads:
+            item = self._next_queued()
+            if item is None:
+                # every queued host is at its limit; a finish re-runs this
+                if not self._host_cap_logged:
+                    self._host_cap_logged = True
+                    self.log(f"Per-site limit: at most {MAX_PER_HOST} downloads from one site run at once")
+                break
+            url, use_best = item
+            self.log("Processing:", url)
+            self._start_worker(url, use_best=use_best, format_id=self.batch_format_id, sections=self.batch_sections)
+        if not self.queue and self.active_downloads == 0 and self.gallery_pending:
+            urls, self.gallery_pending = self.gallery_pending, []
+            self.log(f"Image/gallery detected — using gallery-dl for {len(urls)} url(s)")
+            self._start_gallery(urls)
+        self._check_batch_complete()
+
+    def _check_batch_complete(self):
+        if not self.batch_total or self.batch_done < self.batch_total or self._batch_reported:
             return
-        url = self.queue.pop(0)
-        self.log("Processing:", url)
-        # detect content type with yt-dlp info; lazy import
-        try:
-            import yt_dlp
-        except Exception:
-            QMessageBox.warning(self, "Missing", "yt-dlp not installed.")
+        self._batch_reported = True
+        self.log("Batch complete.")
+        self.status_label.setText("All done.")
+        # one dialog per batch, shown only once nothing is left to dispatch:
+        # a modal per item would hold its pool slot until dismissed
+        failed = self.batch_failures
+        if not failed:
+            QMessageBox.information(self, "Downloads finished",
+                                    f"All {self.batch_total} item(s) finished. Saved to: {self.download_dir}")
             return
-        opts = {"quiet": True, "no_warnings": True}
-        cookies = self.cookies_edit.text().strip()
-        if cookies:
-            opts["cookiefile"] = cookies
+        lines = [f"{what}: {err.splitlines()[-1] if err else 'unknown error'}" for what, err in failed[:10]]
+        if len(failed) > 10:
+            lines.append(f"... and {len(failed) - 10} more (see log)")
+        if any("login" in (err or "").lower() for _, err in failed):
+            lines.append("\ngallery-dl indicates login required. Provide cookies.txt in Cookies field.")
+        QMessageBox.warning(self, "Downloads finished with errors",
+                            f"{len(failed)} error(s) in a batch of {self.batch_total}:\n\n" + "\n".join(lines))
+
+    def _mark_done(self, n=1):
+        self._batch_lock.lock()
         try:
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-            formats = info.get("formats") or []
-            has_video = any((f.get("vcodec") and f.get("vcodec") != "none") for f in formats)
-            has_audio = any((f.get("acodec") and f.get("acodec") != "none") for f in formats)
-            if has_video or has_audio:
-                # start yt-dlp worker
-                self._start_worker(url, use_best=use_best, format_id=format_id, sections=sections)
-            else:
-                # image/gallery -> gallery-dl
-                self.log("Image/gallery detected — using gallery-dl")
-                self._start_gallery(url)
-        except Exception as e:
-            msg = str(e)
-            if "no video" in msg.lower() or "there is no video" in msg.lower() or "unsupported url" in msg.lower():
-                self.log("No video detected — trying gallery-dl fallback.")
-                self._start_gallery(url)
-            elif "requested format is not available" in msg.lower():
-                self.log("Requested format not available — falling back to best.")
-                self._start_worker(url, use_best=True, format_id=None, sections=sections)
-            else:
-                self.log("Error detecting content:", msg)
-                # mark as done and continue
-                self.batch_done += 1
-                self._update_overall_progress()
-                QtCore.QTimer.singleShot(200, lambda: self._process_next_in_queue(use_best, format_id, sections))
+            self.batch_done += n
+        finally:
+            self._batch_lock.unlock()
+        self._update_overall_progress()
 
     # ---------- Start yt-dlp worker ----------
     def _start_worker(self, url, use_best=True, format_id=None, sections=None):
         self.status_label.setText("Starting yt-dlp...")
-        self.item_target_pct = 0.0
-        self.item_display_pct = 0.0
-        self.item_progress.setValue(0)
-        self.current_worker = YTDLPWorker(url, self.download_dir, format_id=format_id,
-                                          cookies=self.cookies_edit.text().strip() or None,
-                                          proxy=self.proxy, sections=sections,
-                                          retries=3, use_best=use_best)
-        self.current_worker.progress.connect(self._on_item_progress)
-        self.current_worker.status.connect(lambda s: self.log(s))
-        self.current_worker.finished.connect(self._on_worker_finished)
-        self.current_worker.start()
-
-    def _on_item_progress(self, pct, info):
-        # update target percent and show info (speed)
+        self.item_pcts[url] = 0.0
+        self.active_downloads += 1
+        self.host_active[_url_host(url)] += 1
+        worker = YTDLPWorker(url, self.download_dir, format_id=format_id,
+                             cookies=self.cookies_edit.text().strip() or None,
+                             proxy=self.proxy, sections=sections,
+                             retries=3, use_best=use_best,
+                             concurrent_fragments=self.concurrent_fragments,
+                             aria2c=self._aria2c_path(),
+                             board=self.progress_board, cancel=self.cancel_event)
+        # workers emit from pool threads; be explicit that every GUI slot is
+        # queued onto the main thread rather than relying on AutoConnection
+        worker.signals.status.connect(self.log, Qt.QueuedConnection)
+        worker.signals.finished.connect(self._on_worker_finished, Qt.QueuedConnection)
+        self.pool.start(worker)
+        if not self.progress_timer.isActive():
+            self.progress_timer.start()
+
+    def _flush_progress(self):
+        for url, (pct, info) in self.progress_board.take().items():
+            self._on_item_progress(url, pct, info)
+        if self.active_downloads == 0:
+            self.progress_timer.stop()
+
+    def _on_item_progress(self, url, pct, info):
+        # item bar shows the mean of all in-flight items
+        if url not in self.item_pcts:
+            return  # late update from a worker that already finished
         try:
-            self.item_target_pct = float(pct)
+            self.item_pcts[url] = float(pct)
         except Exception:
-            self.item_target_pct = 0.0
+            self.item_pcts[url] = 0.0
+        target = sum(self.item_pcts.values()) / len(self.item_pcts)
+        # the bar only shows whole percents; don't restart the animation for
+        # sub-percent moves
+        if int(target) == self.item_progress.value() and self.item_anim.state() != QVariantAnimation.Running:
+            target = None
+        if target is not None:
+            # retarget from the exact interpolated value, not the int the bar
+            # shows, so a mid-flight retarget doesn't step backwards
+            start = self.item_anim.currentValue() if self.item_anim.state() == QVariantAnimation.Running else None
+            self.item_anim.stop()
+            self.item_anim.setStartValue(float(start if start is not None else self.item_progress.value()))
+            self.item_anim.setEndValue(target)
+            self.item_anim.start()
+        self.overall_progress.setValue(self._overall_pct())
         if info:
             self.status_label.setText(f"{pct:.1f}% {info}")
         self.log(f"Progress: {pct:.1f}% {info}")
 
-    def _animate_item_progress(self):
-        # interpolate displayed percent toward target for smooth animation
-        try:
-            diff = self.item_target_pct - self.item_display_pct
-            step = max(0.5, abs(diff) * 0.2)
-            if abs(diff) < 0.01:
-                self.item_display_pct = self.item_target_pct
-            else:
-                self.item_display_pct += step if diff > 0 else -step
-            self.item_progress.setValue(int(self.item_display_pct))
-        except Exception:
-            pass
+    def _set_item_value(self, v):
+        v = int(v)
+        if v != self.item_progress.value():
+            self.item_progress.setValue(v)
 
     def _on_worker_finished(self, res):
+        url = res.get("url")
+        self.item_pcts.pop(url, None)
+        self.active_downloads -= 1
+        self.host_active[_url_host(url)] -= 1
         if res.get("ok"):
-            self.log("Downloaded:", res.get("url"))
-            QMessageBox.information(self, "Downloaded", f"Saved: {res.get('url')}")
+            self.log("Downloaded:", url)
         else:
             err = res.get("error") or ""
             self.log("Worker failed:", err)
-            # if failure looks like no video, attempt gallery-dl
-            if "no video" in err.lower() or "there is no video" in err.lower() or "unsupported url" in err.lower():
-                self.log("Attempting gallery-dl fallback...")
-                self._start_gallery(res.get("url"))
+            # if failure looks like no video, queue it for gallery-dl (counted there)
+            if is_no_video_error(err):
+                self.log("No video detected — queued for gallery-dl fallback.")
+                self.gallery_pending.append(url)
+                self._advance_queue()
                 return
-            elif "requested format is not available" in err.lower():
-                self.log("Format unavailable — retrying with best quality")
-                self._start_worker(res.get("url"), use_best=True)
+            elif is_format_unavailable_error(err):
+                self.log("Format unavailable — retrying with best quality (reusing fetched info)")
+                self._start_worker(url, use_best=True, sections=self.batch_sections)
                 return
             else:
-                QMessageBox.warning(self, "Download failed", err)
+                self.batch_failures.append((url, err))
         # update batch progress and move next
-        self.batch_done += 1
-        self._update_overall_progress()
-        QtCore.QTimer.singleShot(200, lambda: self._process_next_in_queue(self.best_checkbox.isChecked(), self.format_combo.currentData(), None))
+        self._mark_done()
+        self._advance_queue()
 
     # ---------- Start gallery-dl worker ----------
-    def _start_gallery(self, url):
-        self.gallery_worker = GalleryDLWorker(url, self.download_dir, cookies=self.cookies_edit.text().strip() or None)
-        self.gallery_worker.status.connect(lambda s: self.log(s))
-        self.gallery_worker.finished.connect(self._on_gallery_finished)
-        self.gallery_worker.start()
+    def _start_gallery(self, urls):
+        if not (GALLERYDL_IMPORTABLE or self._gallerydl_exe):
+            self._on_gallery_finished({"ok": False, "urls": list(urls), "out": "gallery-dl not found (install it)."})
+            return
+        worker = GalleryDLWorker(urls, self.download_dir, cookies=self.cookies_edit.text().strip() or None,
+                                 exe=self._gallerydl_exe, cancel=self.cancel_event)
+        worker.signals.status.connect(self.log, Qt.QueuedConnection)
+        worker.signals.files.connect(self._on_gallery_files, Qt.QueuedConnection)
+        worker.signals.finished.connect(self._on_gallery_finished, Qt.QueuedConnection)
+        self.pool.start(worker)
+
+    def _on_gallery_files(self, downloaded, skipped):
+        self.status_label.setText(f"gallery-dl: {downloaded} downloaded, {skipped} skipped")
 
     def _on_gallery_finished(self, res):
+        urls = res.get("urls") or []
         if res.get("ok"):
             self.log("gallery-dl success:", res.get("out"))
-            QMessageBox.information(self, "gallery-dl", res.get("out") or "gallery-dl finished")
         else:
             out = res.get("out") or ""
             self.log("gallery-dl failed:", out)
-            if "redirect to login" in out.lower() or "login" in out.lower():
-                QMessageBox.warning(self, "Login required", "gallery-dl indicates login required. Provide cookies.txt in Cookies field.")
-            else:
-                QMessageBox.warning(self, "gallery-dl failed", out)
-        self.batch_done += 1
-        self._update_overall_progress()
-        QtCore.QTimer.singleShot(200, lambda: self._process_next_in_queue(self.best_checkbox.isChecked(), self.format_combo.currentData(), None))
+            self.batch_failures.append((f"gallery-dl ({len(urls)} url(s))", out))
+        self._mark_done(len(urls))
+        self._advance_queue()
 
     # ---------- Overall progress ----------
+    def _overall_pct(self):
+        if self.batch_total <= 0:
+            return 0
+        self._batch_lock.lock()
+        try:
+            done = self.batch_done
+        finally:
+            self._batch_lock.unlock()
+        return int((done * 100 + sum(self.item_pcts.values())) / self.batch_total)
+
     def _update_overall_progress(self):
         try:
+            pct = self._overall_pct()
+            if pct != self.overall_progress.value():
+                self.overall_progress.setValue(pct)
             if self.batch_total <= 0:
-                self.overall_progress.setValue(0)
                 return
-            pct = int((self.batch_done / self.batch_total) * 100)
-            self.overall_progress.setValue(pct)
-            self.log(f"Batch {self.batch_done}/{self.batch_total}")
+            # log once per whole-percent step of finished items; on large
+            # batches most completions don't move it
+            done_pct = int(self.batch_done * 100 / self.batch_total)
+            if done_pct != self._last_logged_done_pct:
+                self._last_logged_done_pct = done_pct
+                self.log(f"Batch {self.batch_done}/{self.batch_total}")
         except Exception:
             pass
 
-    # ---------- gallery-dl direct run helper ----------
-    def _run_gallery_dl(self, url):
-        # Synchronous helper (used for simple calls)
-        try:
-            cmd = ["gallery-dl", "-d", str(self.download_dir), url]
-            cookies = self.cookies_edit.text().strip()
-            if cookies:
-                cmd.extend(["--cookies", cookies])
-            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=90)
-            if proc.returncode == 0:
-                return True, proc.stdout.strip() or "gallery-dl finished"
-            else:
-                return False, (proc.stderr or proc.stdout or f"exit {proc.returncode}").strip()
-        except FileNotFoundError:
-            return False, "gallery-dl not found"
-        except subprocess.TimeoutExpired:
-            return False, "gallery-dl timeout"
-        except Exception as e:
-            return False, f"gallery-dl error: {e}"
-
 # -------------- Entrypoint --------------
 def main():
     app = QApplication(sys.argv)
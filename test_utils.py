@@ -1,5 +1,5 @@
 import re
-from multi_downloader_polished import normalize_url, friendly_size, seconds_to_hhmmss
+from multi_downloader_polished import normalize_url, friendly_size, seconds_to_hhmmss, _classify
 
 def test_normalize_url_reddit_media():
     u = "https://www.reddit.com/media?url=https%3A%2F%2Fi.redd.it%2Fabc123.jpg"
@@ -7,8 +7,23 @@ def test_normalize_url_reddit_media():
 
 def test_friendly_size():
     assert friendly_size(1024).endswith("KB")
+    assert friendly_size(1023) == "1023.0B"
+    assert friendly_size(1536) == "1.5KB"
+    assert friendly_size(5 * 1024 ** 3) == "5.0GB"
     assert friendly_size(None) == "N/A"
 
 def test_seconds_to_hhmmss():
     assert seconds_to_hhmmss(0) == "0:00:00"
     assert re.match(r"0:01:05|00:01:05", seconds_to_hhmmss(65))
+
+def test_normalize_url_strips_tracking_params():
+    u = "https://example.com/watch?v=abc&utm_source=x&fbclid=y"
+    assert normalize_url(u) == "https://example.com/watch?v=abc"
+    assert normalize_url("https://example.com/a?b=1") == "https://example.com/a?b=1"
+
+def test_classify():
+    assert _classify("https://www.reddit.com/gallery/abc123") == "gallery"
+    assert _classify("https://imgur.com/a/xyz") == "gallery"
+    assert _classify("https://example.com/pic.jpg?x=1") == "gallery"
+    assert _classify("https://m.youtube.com/watch?v=abc") == "video"
+    assert _classify("https://unknown.example/post/1") == "auto"